@@ -1,8 +1,274 @@
 # lut_interpolator.py
 
+import hashlib
+import os
+
 import numpy as np
 import pandas as pd
-from scipy.interpolate import RBFInterpolator
+from scipy.interpolate import RBFInterpolator, RegularGridInterpolator
+from scipy.spatial.distance import cdist
+from scipy.special import xlogy
+
+try:
+    import numba
+except ImportError:  # numba is optional; pure-NumPy fallbacks are used
+    numba = None
+
+
+# Radial kernels as used internally by scipy's RBFInterpolator
+# (r is already scaled by epsilon).
+_RBF_KERNELS = {
+    "linear": lambda r: -r,
+    "thin_plate_spline": lambda r: xlogy(r**2, r),
+    "cubic": lambda r: r**3,
+    "quintic": lambda r: -r**5,
+    "multiquadric": lambda r: -np.sqrt(r**2 + 1),
+    "inverse_multiquadric": lambda r: 1 / np.sqrt(r**2 + 1),
+    "inverse_quadratic": lambda r: 1 / (r**2 + 1),
+    "gaussian": lambda r: np.exp(-r**2),
+}
+
+
+# Scalar kernel expressions (in terms of the squared distance r2) used
+# when code-generating the specialized predict function; they must be
+# numba-compilable, unlike the vectorized xlogy form above.
+_NJIT_KERNEL_EXPRS = {
+    "linear": "-np.sqrt(r2)",
+    "thin_plate_spline": "(0.5 * r2 * np.log(r2)) if r2 > 0.0 else 0.0",
+    "cubic": "r2 * np.sqrt(r2)",
+    "quintic": "-r2 * r2 * np.sqrt(r2)",
+    "multiquadric": "-np.sqrt(r2 + 1.0)",
+    "inverse_multiquadric": "1.0 / np.sqrt(r2 + 1.0)",
+    "inverse_quadratic": "1.0 / (r2 + 1.0)",
+    "gaussian": "np.exp(-r2)",
+}
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    """
+    Read one LUT CSV, preferring the pyarrow parser when available (its
+    vectorized numeric parsing is several times faster than the default
+    engine), and narrow the columns: length_nm to int32, everything else
+    to float32. The tabulated values carry at most ~5 significant
+    figures, so float32 loses nothing while halving the bytes every
+    downstream pivot and fit has to touch.
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(path)
+
+    for col in df.columns:
+        if col == "length_nm":
+            df[col] = df[col].astype(np.int32)
+        else:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def _fit_rbf_plane(job):
+    """
+    Fit one VDS plane's multi-RHS RBF. Top-level so a process pool can
+    pickle it; `job` is (vds, X, Y, kernel, epsilon, neighbors).
+    """
+    vds, X, Y, kernel, epsilon, neighbors = job
+    return vds, RBFInterpolator(X, Y, kernel=kernel, epsilon=epsilon,
+                                neighbors=neighbors)
+
+
+def _estimate_length_core(gmro_pred, gmro_measured, lengths):
+    """
+    Bracket-search core of estimate_length_from_gmro: gmro_pred holds
+    the predicted gmro at every tabulated length (already interpolated
+    to the query gm_id on each length's raw curve).
+
+    Written in scalar/loop form so numba can compile it; without numba it
+    runs as-is on NumPy arrays. Returns (L_est, L_disc) as floats; a
+    negative L_est would never occur, so no sentinel is needed.
+    """
+    # First sign change of (gmro_pred - gmro_measured) is the bracket
+    diff = gmro_pred - gmro_measured
+    sign = np.sign(diff)
+    for i in range(sign.shape[0] - 1):
+        if sign[i] != sign[i + 1]:
+            L1 = lengths[i]
+            L2 = lengths[i + 1]
+            g1 = gmro_pred[i]
+            g2 = gmro_pred[i + 1]
+
+            if abs(g2 - g1) < 1e-12:
+                # essentially flat; take midpoint
+                L_est = 0.5 * (L1 + L2)
+            else:
+                t = (gmro_measured - g1) / (g2 - g1)
+                L_est = L1 + t * (L2 - L1)
+
+            L_disc = L1 if L1 > L2 else L2
+            return L_est, L_disc
+
+    # No bracket: fall back to the nearest predicted gmro
+    L_disc = lengths[np.argmin(np.abs(diff))]
+    return L_disc, L_disc
+
+
+if numba is not None:
+    _estimate_length_core = numba.njit(cache=True, fastmath=True)(
+        _estimate_length_core)
+
+
+class _WendlandRBF:
+    """
+    Compactly-supported Wendland C2 RBF interpolator:
+
+        phi(r) = (1 - r/rho)_+^4 * (4*r/rho + 1)
+
+    The kernel vanishes beyond the support radius rho, so the kernel
+    matrix only couples nearby centers: it assembles as a sparse CSR via
+    a cKDTree neighbor query and factorizes with a sparse LU instead of
+    the dense O(N^3) solve a global kernel needs. Coordinates are
+    normalized to the unit box first (gm_id and length_nm live on very
+    different scales), and rho is measured in that normalized space.
+
+    Accepts a vector-valued RHS like scipy's RBFInterpolator and is
+    callable the same way.
+    """
+
+    def __init__(self, X, Y, support_radius=None):
+        from scipy.sparse.linalg import splu
+        from scipy.spatial import cKDTree
+
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        self._y_1d = Y.ndim == 1
+        if self._y_1d:
+            Y = Y[:, None]
+
+        self._xmin = X.min(axis=0)
+        span = X.max(axis=0) - self._xmin
+        span[span == 0] = 1.0
+        self._xspan = span
+        Xs = (X - self._xmin) / self._xspan
+
+        self._tree = cKDTree(Xs)
+        self._centers = Xs
+
+        if support_radius is None:
+            # Distance to the ~30th nearest neighbor keeps roughly that
+            # many centers inside each point's support band.
+            k = min(31, len(Xs))
+            d, _ = self._tree.query(Xs, k=k)
+            support_radius = float(np.mean(d[:, -1]))
+            # On a strongly anisotropic table (dense in gm_id, sparse in
+            # length) that estimate can fall below the spacing between
+            # adjacent grid rows, leaving queries between rows outside
+            # every center's support. Widen it to bridge the largest
+            # adjacent-value gap on each axis, with headroom (a bare 1x
+            # gap leaves mid-row queries touching only two rows' edges).
+            for j in range(Xs.shape[1]):
+                vals = np.unique(Xs[:, j])
+                if vals.size > 1:
+                    gap = float(np.max(np.diff(vals)))
+                    support_radius = max(support_radius, 2.0 * gap)
+        self.rho = float(support_radius)
+
+        A = self._phi_matrix(Xs)
+        # The factorization is only needed for this one solve; keeping
+        # the SuperLU handle around would also make the object
+        # unpicklable for the joblib build cache.
+        self._coeffs = splu(A.tocsc()).solve(Y)
+
+    @staticmethod
+    def _phi(u):
+        """Wendland C2 on the normalized distance u = r/rho."""
+        return np.where(u < 1.0, (1.0 - u) ** 4 * (4.0 * u + 1.0), 0.0)
+
+    def _phi_matrix(self, Xq):
+        """Sparse (nq, ncenters) kernel matrix for normalized queries."""
+        from scipy import sparse
+
+        hits = self._tree.query_ball_point(Xq, self.rho)
+        counts = np.fromiter((len(h) for h in hits), dtype=np.intp,
+                             count=len(hits))
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        if indptr[-1] == 0:
+            return sparse.csr_matrix((len(Xq), len(self._centers)))
+
+        indices = np.concatenate([np.asarray(h, dtype=np.intp) for h in hits])
+        rows = np.repeat(np.arange(len(Xq)), counts)
+        r = np.linalg.norm(Xq[rows] - self._centers[indices], axis=1)
+        data = self._phi(r / self.rho)
+        return sparse.csr_matrix((data, indices, indptr),
+                                 shape=(len(Xq), len(self._centers)))
+
+    def __call__(self, Xq):
+        Xq = (np.asarray(Xq, dtype=float) - self._xmin) / self._xspan
+        out = self._phi_matrix(Xq) @ self._coeffs
+        return out[:, 0] if self._y_1d else out
+
+
+class _SharedRBFBasis:
+    """
+    Shared RBF evaluation basis for one VDS plane.
+
+    The three quantities are tabulated at the same (gm_id, length_nm)
+    centers per VDS, so the kernel/polynomial matrix Phi of a query batch
+    only has to be built once per plane, then dotted against each
+    quantity's coefficient vector: y[q] = Phi @ coeffs[q].
+    """
+
+    def __init__(self, ref: RBFInterpolator, coeffs: dict,
+                 coeff_dtype: str = "float64"):
+        # Geometry (centers, epsilon, polynomial shift/scale, monomial
+        # powers) is identical across quantities fitted on the same X;
+        # take it from any one of the fitted interpolators.
+        self.kernel = ref.kernel
+        self.epsilon = ref.epsilon
+        self.centers = ref.y * ref.epsilon
+        self.shift = ref._shift
+        self.scale = ref._scale
+        self.powers = ref.powers
+
+        # Coefficient storage dtype. float32 (or bfloat16 storage)
+        # halves/quarters the bytes the Phi @ c product has to move; the
+        # GEMV itself runs in float32 for the narrow dtypes, float64
+        # otherwise. Accuracy depends on the conditioning of the fit —
+        # see the coeff_dtype note in LUTInterpolator.
+        if coeff_dtype == "bfloat16":
+            from ml_dtypes import bfloat16  # optional dependency
+            store_dtype = bfloat16
+            self._eval_dtype = np.float32
+        else:
+            store_dtype = np.dtype(coeff_dtype)
+            self._eval_dtype = (np.float32 if store_dtype == np.float32
+                                else np.float64)
+
+        # coeffs[quantity] = (ncenters + npoly,) coefficient vector
+        self.coeffs = {q: np.asarray(c, dtype=store_dtype)
+                       for q, c in coeffs.items()}
+
+    def _as_eval(self, a: np.ndarray) -> np.ndarray:
+        """Cast an array to the evaluation dtype (no-op for float64)."""
+        return a.astype(self._eval_dtype, copy=False)
+
+    def coeff_matrix(self, quantities) -> np.ndarray:
+        """Stacked per-quantity coefficient columns in the eval dtype."""
+        return self._as_eval(
+            np.column_stack([self.coeffs[q] for q in quantities]))
+
+    def build_basis(self, X: np.ndarray) -> np.ndarray:
+        """Return the (neval, ncenters + npoly) evaluation matrix Phi."""
+        # cdist runs the pairwise distances in one tight C loop instead
+        # of materializing the (neval, ncenters, 2) broadcast temporary.
+        r = cdist(X * self.epsilon, self.centers)
+        Phi_k = _RBF_KERNELS[self.kernel](r)
+        Xp = (X - self.shift) / self.scale
+        P = np.prod(Xp[:, None, :] ** self.powers[None, :, :], axis=-1)
+        return np.hstack([Phi_k, P])
+
+    def evaluate(self, X: np.ndarray, quantities) -> dict:
+        """Evaluate all requested quantities from a single basis build."""
+        Phi = self._as_eval(self.build_basis(X))
+        return {q: Phi @ self._as_eval(self.coeffs[q]) for q in quantities}
 
 
 class LUTInterpolator:
@@ -20,21 +286,94 @@ class LUTInterpolator:
     You call `load_vds_csvs` once per VDS (0.2, 0.4), then `build_interpolators()`.
     """
 
-    def __init__(self, kernel: str = "thin_plate_spline", epsilon=None):
+    def __init__(self, kernel: str = "thin_plate_spline", epsilon=None,
+                 method: str = "grid", neighbors: int = 150,
+                 backend: str = "cpu", support_radius: float = None,
+                 grid_method: str = "cubic", coeff_dtype: str = "float64"):
         self.kernel = kernel
         self.epsilon = epsilon
+        # Support radius for kernel="wendland" (in unit-box-normalized
+        # coordinates); None picks ~the 30th-neighbor distance at build.
+        self.support_radius = support_radius
+        # Storage dtype for the shared-basis RBF coefficients: "float64"
+        # (default), "float32", or "bfloat16" (requires ml_dtypes).
+        # Narrow dtypes halve/quarter the bytes moved per Phi @ c but
+        # are only safe for well-conditioned kernels: the global
+        # thin-plate solve on these tables relies on large cancelling
+        # coefficients and loses several digits in float32.
+        self.coeff_dtype = coeff_dtype
+        # "cuda" fits and evaluates the scattered RBFs on the GPU via
+        # cupyx (worthwhile for sweeps beyond a few thousand points);
+        # requires method="rbf". cupy is imported only when selected.
+        if backend not in ("cpu", "cuda"):
+            raise ValueError(f"Unknown backend '{backend}', expected 'cpu' or 'cuda'")
+        if backend == "cuda" and method != "rbf":
+            raise ValueError("backend='cuda' requires method='rbf'")
+        if backend == "cuda" and kernel == "wendland":
+            raise ValueError("kernel='wendland' is CPU-only")
+        self.backend = backend
+        # Max nearest neighbors per RBF evaluation (rbf mode). Caps the
+        # per-query cost on large tables; None fits/evaluates against all
+        # centers (exact global solve). Capped at the plane size at build.
+        self.neighbors = neighbors
+        # "grid": RegularGridInterpolator on the pivoted (length, gm_id)
+        # grid (the CSVs are tabulated per discrete length, so gridded
+        # interpolation is much cheaper than a dense RBF on the same data).
+        # "rbf": the original scattered-data RBF path, kept as a fallback.
+        if method not in ("grid", "rbf"):
+            raise ValueError(f"Unknown method '{method}', expected 'grid' or 'rbf'")
+        self.method = method
+        # Interpolation order within a grid plane. "linear" additionally
+        # enables the prelookup fast path in predict_all (one index
+        # search shared by all tables).
+        self.grid_method = grid_method
 
         # We expose canonical quantity names
         self.quantities = ["id_w", "gmro", "ft"]
 
-        # data[quantity][vds] = DataFrame(gm_id, length_nm, value)
+        # data[quantity][vds] = {"gm_id", "length_nm", "value"} ndarrays
         self.data = {q: {} for q in self.quantities}
-        # rbf[quantity][vds] = RBFInterpolator over (gm_id, length_nm)
+        # rbf[quantity][vds] = interpolator over (gm_id, length_nm)
         self.rbf = {q: {} for q in self.quantities}
+        # _rbf_vds[vds] = one multi-RHS RBFInterpolator per plane whose
+        # columns follow self.quantities (rbf mode)
+        self._rbf_vds = {}
+        # _basis[vds] = _SharedRBFBasis shared across quantities (rbf mode)
+        self._basis = {}
+        # Deferred rbf-mode fits (lazy build): _pending[vds] holds a
+        # not-yet-run joint plane fit job, _pending_q[(q, vds)] a
+        # per-quantity one; popped and fitted on first use of the plane
+        self._pending = {}
+        self._pending_q = {}
+        # _grid[quantity][vds] = (lengths, gmids, V) pivoted value grids
+        self._grid = {q: {} for q in self.quantities}
+        # _gmro_by_L[vds] = {length: (gm_ids, values)} raw per-length
+        # gmro curves on their exact (unresampled) gm_id axes, used by
+        # estimate_length_from_gmro
+        self._gmro_by_L = {}
+        # _sorted_vds[quantity] = sorted ndarray of available VDS planes,
+        # cached at build time for searchsorted bracketing
+        self._sorted_vds = {}
+        # True when every plane's grid axes match across quantities, so
+        # one prelookup can be shared by all three tables
+        self._grid_aligned = False
+        # Code-generated scalar predict function (rbf mode + numba) and
+        # its packed plane arrays; see _build_specialized_predict
+        self._predict_fn = None
+        self._spec_args = None
+
+        # Reusable query buffers for the scalar path: building a fresh
+        # (1, 2) array per predict() call dominates at batch size 1.
+        # Per-instance, so concurrent threads need separate instances.
+        self._X_scratch = np.empty((1, 2))
+        self._t_scratch = np.empty(1)
 
         # Set of available channel lengths (from the CSVs)
         self.lengths = None
 
+        # Source CSV paths, tracked for the build cache key
+        self._source_files = []
+
     # -------------------------
     # Internal helpers
     # -------------------------
@@ -42,29 +381,31 @@ class LUTInterpolator:
                      quantity_col: str, quantity_name: str):
         """
         df has columns: length_nm, ngm_id, <quantity_col>.
-        This normalizes them to: gm_id, length_nm, value.
+        This normalizes them to contiguous gm_id / length_nm / value
+        arrays (no DataFrame copy; pandas stays out of the hot path).
         """
-        df = df.copy()
+        gm_id = df["ngm_id"].to_numpy(copy=False)
+        length_nm = df["length_nm"].to_numpy(copy=False)
+        value = df[quantity_col].to_numpy(copy=False)
 
-        df.rename(
-            columns={
-                "length_nm": "length_nm",
-                "ngm_id": "gm_id",
-                quantity_col: "value",
-            },
-            inplace=True,
-        )
+        # dropna equivalent on the float columns (length_nm is integral)
+        keep = np.isfinite(gm_id) & np.isfinite(value)
+        if not keep.all():
+            gm_id = gm_id[keep]
+            length_nm = length_nm[keep]
+            value = value[keep]
 
-        df = df[["gm_id", "length_nm", "value"]].dropna()
+        d = {"gm_id": gm_id, "length_nm": length_nm, "value": value}
         vds = float(vds)
 
         if vds not in self.data[quantity_name]:
-            self.data[quantity_name][vds] = df
+            self.data[quantity_name][vds] = d
         else:
             # Just in case you ever load in pieces for same VDS
-            self.data[quantity_name][vds] = pd.concat(
-                [self.data[quantity_name][vds], df], ignore_index=True
-            )
+            prev = self.data[quantity_name][vds]
+            self.data[quantity_name][vds] = {
+                k: np.concatenate([prev[k], d[k]]) for k in d
+            }
 
     # -------------------------
     # Public: data loading
@@ -88,9 +429,13 @@ class LUTInterpolator:
             Path to nidw_vs_ngm_id_with_length_XXX.csv.
         """
 
+        for p in (ft_path, gmro_path, idw_path):
+            if p is not None:
+                self._source_files.append(p)
+
         # --- ft (nft) ---
         if ft_path is not None:
-            df_ft = pd.read_csv(ft_path)
+            df_ft = _read_csv(ft_path)
             # Column name is typically "nft"
             ft_col_candidates = [
                 c for c in df_ft.columns if c.lower().endswith("ft")]
@@ -101,7 +446,7 @@ class LUTInterpolator:
 
         # --- gmro (ngmro) ---
         if gmro_path is not None:
-            df_gmro = pd.read_csv(gmro_path)
+            df_gmro = _read_csv(gmro_path)
             gmro_col_candidates = [
                 c for c in df_gmro.columns if "gmro" in c.lower()]
             if not gmro_col_candidates:
@@ -111,7 +456,7 @@ class LUTInterpolator:
 
         # --- Id/W (nidw) ---
         if idw_path is not None:
-            df_idw = pd.read_csv(idw_path)
+            df_idw = _read_csv(idw_path)
             idw_col_candidates = [
                 c for c in df_idw.columns if "idw" in c.lower()]
             if not idw_col_candidates:
@@ -122,120 +467,810 @@ class LUTInterpolator:
     # -------------------------
     # Build interpolators
     # -------------------------
-    def build_interpolators(self):
+    @staticmethod
+    def _split_by_length(d: dict) -> dict:
+        """
+        One-shot groupby: sort the plane once by (length_nm, gm_id) and
+        slice it into per-length views, instead of a boolean scan of the
+        whole plane for every length.
+
+        Returns {length: (gm_ids_sorted, values_sorted)}.
         """
-        Build 2D RBF interpolators for each quantity and each VDS:
+        order = np.lexsort((d["gm_id"], d["length_nm"]))
+        length_s = d["length_nm"][order]
+        gm_s = d["gm_id"][order]
+        val_s = d["value"][order]
+
+        lengths, starts = np.unique(length_s, return_index=True)
+        bounds = np.append(starts, len(length_s))
+        return {
+            int(L): (gm_s[bounds[i]:bounds[i + 1]],
+                     val_s[bounds[i]:bounds[i + 1]])
+            for i, L in enumerate(lengths)
+        }
+
+    @classmethod
+    def _pivot_plane(cls, d: dict):
+        """
+        Pivot one (quantity, vds) plane into a rectangular
+        (length_nm x gm_id) value grid.
+
+        The CSV sweeps use a slightly different gm_id axis per length, so
+        each length's curve is resampled onto a shared gm_id axis with 1D
+        linear interpolation before stacking.
+
+        Returns (lengths, gmids, V) with V of shape (n_lengths, n_gmids).
+        """
+        groups = cls._split_by_length(d)
+        lengths = np.array(sorted(groups), dtype=float)
+
+        gm_col = d["gm_id"]
+        n_pts = max(len(g) for g, _ in groups.values())
+        gmids = np.linspace(float(gm_col.min()), float(gm_col.max()), n_pts)
+
+        V = np.empty((len(lengths), len(gmids)))
+        for i, L in enumerate(lengths):
+            gmids_L, vals_L = groups[int(L)]
+            V[i] = np.interp(gmids, gmids_L, vals_L)
+
+        return lengths, gmids, V
+
+    def _cache_key(self) -> str:
+        """
+        Cache key for the built interpolators: the build parameters plus
+        (path, mtime, size) of every loaded CSV, so editing or swapping
+        any source file invalidates the cache.
+        """
+        parts = [f"{self.method}:{self.kernel}:{self.epsilon}:"
+                 f"{self.neighbors}:{self.grid_method}:{self.coeff_dtype}:"
+                 f"{self.backend}:{self.support_radius}"]
+        for p in sorted(self._source_files):
+            st = os.stat(p)
+            parts.append(f"{p}:{st.st_mtime_ns}:{st.st_size}")
+        return hashlib.blake2b("|".join(parts).encode(),
+                               digest_size=16).hexdigest()
+
+    def build_interpolators(self, cache_dir: str = None,
+                            max_workers: int = None, lazy: bool = True):
+        """
+        Build 2D interpolators for each quantity and each VDS:
             (gm_id, length_nm) -> value
 
+        method="grid" pivots each plane onto a (length_nm x gm_id) grid
+        and uses a cubic RegularGridInterpolator; method="rbf" keeps the
+        scattered-data RBF fit.
+
         For intermediate VDS values, interpolation is done *afterwards*
         by linear interpolation between neighboring VDS planes.
+
+        With `lazy=True` (the default) the rbf-mode plane fits are
+        deferred: build only validates and records each plane's fit job,
+        and a plane is fitted the first time a prediction touches it.
+        Workloads that never query a plane — or only call
+        estimate_length_from_gmro, which works from the raw gmro tables —
+        skip those factorizations entirely. Grid-mode pivots are cheap
+        and always built up front.
+
+        If `cache_dir` is given, the built interpolators and pivoted
+        grids are persisted there (joblib, keyed by the source CSVs'
+        path/mtime/size and the build parameters), so subsequent runs on
+        unchanged CSVs skip the fits entirely.
+
+        `max_workers` fans the independent per-plane RBF fits out to a
+        process pool (rbf mode; see _build_rbf_planes). Both caching and
+        a worker pool imply fitting everything now, so either option
+        overrides `lazy`.
         """
+        if cache_dir is not None:
+            import joblib  # deferred: only needed when caching
+
+            cache_path = os.path.join(
+                cache_dir, f"lut_{self._cache_key()}.joblib")
+
+            if os.path.exists(cache_path):
+                state = joblib.load(cache_path)
+                self.rbf = state["rbf"]
+                self._rbf_vds = state["rbf_vds"]
+                self._basis = state["basis"]
+                self._grid = state["grid"]
+                # caches written before the raw-curve store lack the
+                # key; the curves regroup cheaply from the loaded CSVs
+                self._gmro_by_L = state.get("gmro_by_L") or {
+                    float(v): self._split_by_length(d)
+                    for v, d in self.data["gmro"].items()
+                }
+                self._sorted_vds = state["sorted_vds"]
+                self.lengths = state["lengths"]
+                self._grid_aligned = self._check_grid_alignment()
+                # compiled functions are not persisted; regenerate
+                self._build_specialized_predict()
+                return
+
+            self._build_all(max_workers=max_workers, lazy=False)
+            os.makedirs(cache_dir, exist_ok=True)
+            joblib.dump(
+                {
+                    "rbf": self.rbf,
+                    "rbf_vds": self._rbf_vds,
+                    "basis": self._basis,
+                    "grid": self._grid,
+                    "gmro_by_L": self._gmro_by_L,
+                    "sorted_vds": self._sorted_vds,
+                    "lengths": self.lengths,
+                },
+                cache_path,
+                compress=3,
+            )
+            return
+
+        self._build_all(max_workers=max_workers,
+                        lazy=lazy and max_workers is None)
+
+    def _build_all(self, max_workers: int = None, lazy: bool = False):
+        """Fit all interpolators from the loaded raw data."""
         self.rbf = {q: {} for q in self.quantities}
+        self._rbf_vds = {}
+        self._basis = {}
+        self._pending = {}
+        self._pending_q = {}
+        self._grid = {q: {} for q in self.quantities}
         all_lengths = set()
 
         for q in self.quantities:
-            for vds, df in self.data[q].items():
-                all_lengths.update(df["length_nm"].unique())
+            for vds, d in self.data[q].items():
+                all_lengths.update(np.unique(d["length_nm"]))
+
+                if self.method == "grid":
+                    lengths, gmids, V = self._pivot_plane(d)
+                    self._grid[q][float(vds)] = (lengths, gmids, V)
+                    self.rbf[q][float(vds)] = RegularGridInterpolator(
+                        (lengths, gmids), V,
+                        method=self.grid_method,
+                        bounds_error=False,
+                        fill_value=None,
+                    )
+
+        if self.method == "rbf":
+            self._build_rbf_planes(max_workers=max_workers, lazy=lazy)
+
+        # Group the raw gmro planes by length once for
+        # estimate_length_from_gmro, so the per-call work is one
+        # np.interp per tabulated length rather than a pandas filter.
+        self._gmro_by_L = {
+            float(vds): self._split_by_length(d)
+            for vds, d in self.data["gmro"].items()
+        }
+
+        self._sorted_vds = {q: np.asarray(self._available_vds(q))
+                            for q in self.quantities}
+        self._grid_aligned = self._check_grid_alignment()
+        self._build_specialized_predict()
+
+        if all_lengths:
+            self.lengths = sorted(int(L) for L in all_lengths)
+
+    def _check_grid_alignment(self) -> bool:
+        """
+        True if every VDS plane's grid axes are identical across the
+        three quantities (they are whenever the CSVs come from the same
+        sweep), enabling the shared-prelookup fast path.
+        """
+        if self.method != "grid":
+            return False
+        ref = self._grid[self.quantities[0]]
+        for q in self.quantities[1:]:
+            if self._grid[q].keys() != ref.keys():
+                return False
+            for vds, (lengths, gmids, _) in self._grid[q].items():
+                if not (np.array_equal(lengths, ref[vds][0])
+                        and np.array_equal(gmids, ref[vds][1])):
+                    return False
+        return bool(ref)
+
+    def _planes_aligned(self, planes: dict) -> bool:
+        """
+        True if the three quantities of one VDS plane were swept at the
+        exact same (gm_id, length_nm) rows. The stacked multi-RHS fit is
+        only valid under this alignment; misaligned planes fall back to
+        per-quantity fits.
+        """
+        ref = planes[self.quantities[0]]
+        return all(
+            np.array_equal(d["gm_id"], ref["gm_id"])
+            and np.array_equal(d["length_nm"], ref["length_nm"])
+            for d in planes.values())
+
+    def _build_rbf_planes(self, max_workers: int = None,
+                          lazy: bool = False):
+        """
+        Fit the scattered-data RBF interpolators, one per VDS plane.
+
+        The three quantities share the same (gm_id, length_nm) centers per
+        VDS, so their values are stacked into one vector-valued RHS and
+        fitted with a single RBFInterpolator per plane: one factorization
+        instead of three, and one evaluation returning all quantities.
+        Planes missing a quantity fall back to per-quantity fits.
 
-                X = df[["gm_id", "length_nm"]].values
-                y = df["value"].values
+        With lazy=True the scipy fit jobs are only recorded (_pending /
+        _pending_q) and run on first use via _ensure_plane, so untouched
+        planes never pay their factorization. GPU and Wendland fits are
+        always built here.
 
-                self.rbf[q][float(vds)] = RBFInterpolator(
-                    X, y,
+        With max_workers set, the per-plane fits (independent, CPU-bound
+        dense factorizations) run in a process pool; this pays off once
+        the planes are large enough that each fit outweighs the worker
+        startup and pickling cost. GPU and Wendland fits stay serial
+        (their handles cannot cross process boundaries).
+
+        With backend="cuda" the fits live on the GPU (cupyx), and
+        predictions should go through predict_batch_gpu.
+        """
+        if self.backend == "cuda":
+            import cupy as cp
+            from cupyx.scipy.interpolate import RBFInterpolator as _RBF
+
+            def _to_device(a):
+                return cp.asarray(a, dtype=cp.float64)
+        else:
+            _RBF = RBFInterpolator
+
+            def _to_device(a):
+                return a
+
+        jobs = []  # picklable plane fits, dispatched below
+
+        for vds in sorted(set().union(*(self.data[q].keys() for q in self.quantities))):
+            planes = {q: self.data[q].get(vds) for q in self.quantities}
+
+            if all(d is not None for d in planes.values()) \
+                    and self._planes_aligned(planes):
+                ref = planes[self.quantities[0]]
+                X = np.column_stack([ref["gm_id"], ref["length_nm"]])
+                Y = np.column_stack(
+                    [planes[q]["value"] for q in self.quantities])
+
+                if self.kernel == "wendland":
+                    f = _WendlandRBF(X, Y,
+                                     support_radius=self.support_radius)
+                    self._rbf_vds[float(vds)] = f
+                    continue
+
+                neighbors = self.neighbors
+                if neighbors is not None:
+                    neighbors = min(int(neighbors), len(X))
+
+                if self.backend == "cpu":
+                    job = (float(vds), X, Y,
+                           self.kernel, self.epsilon, neighbors)
+                    if lazy:
+                        self._pending[float(vds)] = job
+                    else:
+                        jobs.append(job)
+                    continue
+
+                f = _RBF(
+                    _to_device(X), _to_device(Y),
                     kernel=self.kernel,
                     epsilon=self.epsilon,
+                    neighbors=neighbors,
                 )
+                self._rbf_vds[float(vds)] = f
+            else:
+                # Partial plane: fit whatever quantities are present
+                for q, d in planes.items():
+                    if d is None:
+                        continue
+                    Xq_plane = np.column_stack([d["gm_id"], d["length_nm"]])
+                    if self.kernel == "wendland":
+                        self.rbf[q][float(vds)] = _WendlandRBF(
+                            Xq_plane, d["value"],
+                            support_radius=self.support_radius)
+                    elif lazy and self.backend == "cpu":
+                        self._pending_q[(q, float(vds))] = (
+                            Xq_plane, np.asarray(d["value"], dtype=float))
+                    else:
+                        self.rbf[q][float(vds)] = _RBF(
+                            _to_device(Xq_plane),
+                            _to_device(np.asarray(d["value"], dtype=float)),
+                            kernel=self.kernel,
+                            epsilon=self.epsilon,
+                        )
 
-        if all_lengths:
-            self.lengths = sorted(int(L) for L in all_lengths)
+        if max_workers is not None and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                    max_workers=min(max_workers, len(jobs))) as ex:
+                fitted = list(ex.map(_fit_rbf_plane, jobs))
+        else:
+            fitted = [_fit_rbf_plane(job) for job in jobs]
+
+        for (vds, _, _, _, _, neighbors), (_, f) in zip(jobs, fitted):
+            self._rbf_vds[vds] = f
+
+            # Global solve (neighbors=None) exposes per-quantity
+            # coefficient columns, letting the evaluation basis be
+            # shared across quantities.
+            if neighbors is None:
+                coeffs = {q: f._coeffs[:, i]
+                          for i, q in enumerate(self.quantities)}
+                self._basis[vds] = _SharedRBFBasis(
+                    f, coeffs, coeff_dtype=self.coeff_dtype)
+
+    def _build_specialized_predict(self):
+        """
+        Code-generate and njit-compile a scalar predict_all kernel
+        specialized for the built planes: the plane count K, the kernel
+        formula, and the polynomial tail are baked into the generated
+        source as literals, so a scalar query runs as one tight compiled
+        loop (VDS bracket + two plane evaluations) with no Python
+        dispatch, no scipy call, and no temporaries.
+
+        Only applies when every plane has a shared global-solve basis
+        (method="rbf", backend="cpu", neighbors=None, a scipy kernel)
+        and numba is importable; otherwise predict_all keeps its generic
+        path. Plane data is packed into contiguous stacks padded to the
+        largest plane; per-plane center counts bound the inner loop.
+        """
+        self._predict_fn = None
+        self._spec_args = None
+
+        if (numba is None or self.method != "rbf"
+                or self.backend != "cpu"
+                or self.kernel not in _NJIT_KERNEL_EXPRS):
+            return
+        planes = sorted(self._basis)
+        if len(planes) < 2 or set(planes) != set(self._rbf_vds):
+            return
+        if any(self.rbf[q] for q in self.quantities):
+            # some plane fell back to per-quantity fits; stacks would
+            # not cover it
+            return
+
+        bases = [self._basis[v] for v in planes]
+        K = len(planes)
+        npoly = bases[0].powers.shape[0]
+        if any(b.powers.shape[0] != npoly
+               or not np.array_equal(b.powers, bases[0].powers)
+               for b in bases):
+            return
+        powers = bases[0].powers
+
+        ncenters = np.array([b.centers.shape[0] for b in bases],
+                            dtype=np.int64)
+        n_max = int(ncenters.max())
+
+        centers = np.zeros((K, n_max, 2))
+        coeffs = np.zeros((K, n_max + npoly, len(self.quantities)))
+        shifts = np.empty((K, 2))
+        scales = np.empty((K, 2))
+        epss = np.empty(K)
+        for p, b in enumerate(bases):
+            n = b.centers.shape[0]
+            centers[p, :n] = b.centers
+            coeffs[p, :n + npoly] = np.stack(
+                [np.asarray(b.coeffs[q], dtype=float)
+                 for q in self.quantities], axis=-1)
+            shifts[p] = b.shift
+            scales[p] = b.scale
+            epss[p] = b.epsilon
+
+        # Polynomial tail, one generated line per (monomial, quantity)
+        poly_lines = []
+        for m, (p0, p1) in enumerate(powers):
+            factors = ["xm0"] * int(p0) + ["xm1"] * int(p1)
+            term = " * ".join(factors) if factors else "1.0"
+            for c in range(len(self.quantities)):
+                poly_lines.append(
+                    f"        a{c} += ({term}) * coeffs[p, n + {m}, {c}]")
+
+        src = f"""
+def _predict_all_specialized(gm_id, vds, L, vds_planes, centers,
+                             ncenters, coeffs, shifts, scales, epss):
+    i = 0
+    for k in range({K - 1}):
+        if vds >= vds_planes[k + 1]:
+            i = k + 1
+    if i > {K - 2}:
+        i = {K - 2}
+    t = (vds - vds_planes[i]) / (vds_planes[i + 1] - vds_planes[i])
+    if t < 0.0:
+        t = 0.0
+    if t > 1.0:
+        t = 1.0
+    y0 = 0.0
+    y1 = 0.0
+    y2 = 0.0
+    for s in range(2):
+        p = i + s
+        w = t if s == 1 else 1.0 - t
+        if w == 0.0:
+            continue
+        eps = epss[p]
+        qx = gm_id * eps
+        qy = L * eps
+        n = ncenters[p]
+        a0 = 0.0
+        a1 = 0.0
+        a2 = 0.0
+        for j in range(n):
+            dx = qx - centers[p, j, 0]
+            dy = qy - centers[p, j, 1]
+            r2 = dx * dx + dy * dy
+            phi = {_NJIT_KERNEL_EXPRS[self.kernel]}
+            a0 += phi * coeffs[p, j, 0]
+            a1 += phi * coeffs[p, j, 1]
+            a2 += phi * coeffs[p, j, 2]
+        xm0 = (gm_id - shifts[p, 0]) / scales[p, 0]
+        xm1 = (L - shifts[p, 1]) / scales[p, 1]
+{chr(10).join(poly_lines)}
+        y0 += w * a0
+        y1 += w * a1
+        y2 += w * a2
+    return y0, y1, y2
+"""
+        ns = {"np": np}
+        exec(compile(src, "<lut specialized predict>", "exec"), ns)
+        self._predict_fn = numba.njit(fastmath=True, boundscheck=False)(
+            ns["_predict_all_specialized"])
+        self._spec_args = (np.asarray(planes, dtype=float), centers,
+                           ncenters, coeffs, shifts, scales, epss)
+
+    def _ensure_plane(self, vds: float):
+        """
+        Materialize any deferred fits for one VDS plane (lazy build).
+
+        Pops the plane's pending job(s), runs the factorization, and
+        wires the result up exactly as the eager build would — including
+        the shared basis for global solves, and the specialized compiled
+        predict function once the last pending plane is in.
+        """
+        job = self._pending.pop(vds, None)
+        materialized = job is not None
+        if job is not None:
+            _, f = _fit_rbf_plane(job)
+            self._rbf_vds[vds] = f
+            neighbors = job[5]
+            if neighbors is None:
+                coeffs = {q: f._coeffs[:, i]
+                          for i, q in enumerate(self.quantities)}
+                self._basis[vds] = _SharedRBFBasis(
+                    f, coeffs, coeff_dtype=self.coeff_dtype)
+
+        for q in self.quantities:
+            pend = self._pending_q.pop((q, vds), None)
+            if pend is not None:
+                materialized = True
+                X, y = pend
+                self.rbf[q][vds] = RBFInterpolator(
+                    X, y, kernel=self.kernel, epsilon=self.epsilon)
+
+        if materialized and not self._pending and not self._pending_q:
+            self._build_specialized_predict()
 
     # -------------------------
     # Internal: VDS helper
     # -------------------------
     def _available_vds(self, quantity: str):
-        return sorted(self.rbf[quantity].keys())
+        avail = set(self.rbf[quantity].keys())
+        if self.method == "rbf":
+            avail.update(self._rbf_vds.keys())
+            avail.update(self._pending.keys())
+            avail.update(v for q, v in self._pending_q if q == quantity)
+        return sorted(avail)
+
+    @staticmethod
+    def _cell(axis: np.ndarray, x: float):
+        """Bracketing index and clamped weight of scalar x on an axis."""
+        i = int(np.clip(np.searchsorted(axis, x) - 1, 0, len(axis) - 2))
+        t = (x - axis[i]) / (axis[i + 1] - axis[i])
+        return i, float(np.clip(t, 0.0, 1.0))
 
-    def _interp_in_vds(self, quantity: str, gm_id: float,
-                       vds: float, length_nm: float) -> float:
+    def _prelookup(self, gm_id: float, vds: float, length_nm: float):
         """
-        Core utility:
-          - If vds exactly matches a loaded plane -> use that RBF.
-          - Else -> linearly interpolate between the two neighboring planes.
-          - Out-of-range vds is clamped to the nearest plane.
+        One-shot index search shared by every table ("prelookup once,
+        interpolate many"): the VDS bracket weight plus, for each of the
+        two bracketing planes, that plane's (i_L, t_L, i_g, t_g) cell.
+
+        Returns (t_v, [(vds_plane, i_L, t_L, i_g, t_g) x 2]).
         """
-        vds = float(vds)
-        gm_id = float(gm_id)
-        length_nm = float(length_nm)
-
-        avail = self._available_vds(quantity)
-        if not avail:
-            raise ValueError(f"No interpolators for quantity '{quantity}'")
-
-        # If we have an exact VDS plane:
-        if vds in self.rbf[quantity]:
-            f = self.rbf[quantity][vds]
-            X = np.array([[gm_id, length_nm]])
-            return float(f(X))
-
-        # Below minimum -> clamp to lowest VDS
-        if vds < avail[0]:
-            f = self.rbf[quantity][avail[0]]
-            X = np.array([[gm_id, length_nm]])
-            return float(f(X))
-
-        # Above maximum -> clamp to highest VDS
-        if vds > avail[-1]:
-            f = self.rbf[quantity][avail[-1]]
-            X = np.array([[gm_id, length_nm]])
-            return float(f(X))
-
-        # Otherwise find bounding VDS values
-        v1, v2 = None, None
-        for i in range(len(avail) - 1):
-            if avail[i] <= vds <= avail[i + 1]:
-                v1, v2 = avail[i], avail[i + 1]
-                break
-
-        if v1 is None:
-            # Fallback: should not happen, but just in case
-            f = self.rbf[quantity][avail[-1]]
-            X = np.array([[gm_id, length_nm]])
-            return float(f(X))
-
-        f1 = self.rbf[quantity][v1]
-        f2 = self.rbf[quantity][v2]
-        X = np.array([[gm_id, length_nm]])
-
-        y1 = float(f1(X))
-        y2 = float(f2(X))
+        arr = self._sorted_vds[self.quantities[0]]
+        i_v, t_v = self._cell(arr, float(vds))
+
+        pre = []
+        for v in (float(arr[i_v]), float(arr[i_v + 1])):
+            lengths, gmids, _ = self._grid[self.quantities[0]][v]
+            i_L, t_L = self._cell(lengths, float(length_nm))
+            i_g, t_g = self._cell(gmids, float(gm_id))
+            pre.append((v, i_L, t_L, i_g, t_g))
+        return t_v, pre
 
+    @staticmethod
+    def _apply_interp(V: np.ndarray, i_L: int, t_L: float,
+                      i_g: int, t_g: float) -> float:
+        """Bilinear blend of the four precomputed corner cells of V."""
+        return ((1 - t_L) * (1 - t_g) * V[i_L, i_g]
+                + (1 - t_L) * t_g * V[i_L, i_g + 1]
+                + t_L * (1 - t_g) * V[i_L + 1, i_g]
+                + t_L * t_g * V[i_L + 1, i_g + 1])
+
+    def _eval_bracket(self, v1: float, v2: float, t: np.ndarray,
+                      X: np.ndarray, quantities) -> dict:
+        """
+        Evaluate the VDS blend y = (1-t)*f_v1(X) + t*f_v2(X) for one
+        bracket group.
+
+        When both planes expose shared coefficient bases and t is
+        uniform over the batch (the common case: a sweep at one
+        intermediate VDS), the blend is folded into the coefficients —
+        Phi1 @ ((1-t)*C1) + Phi2 @ (t*C2) — fusing the two plane
+        evaluations and the blend into two matmuls with no intermediate
+        per-plane results.
+        """
+        if self._pending or self._pending_q:
+            self._ensure_plane(v1)
+            self._ensure_plane(v2)
+
+        b1, b2 = self._basis.get(v1), self._basis.get(v2)
+        t_uniform = t.size > 0 and np.all(t == t.flat[0])
+
+        if b1 is not None and b2 is not None and t_uniform:
+            ts = float(t.flat[0])
+            Phi1 = b1._as_eval(b1.build_basis(X))
+            Phi2 = b2._as_eval(b2.build_basis(X))
+            C1 = b1.coeff_matrix(quantities)
+            C2 = b2.coeff_matrix(quantities)
+            Y = Phi1 @ ((1.0 - ts) * C1) + Phi2 @ (ts * C2)
+            return {q: Y[:, i] for i, q in enumerate(quantities)}
+
+        y1 = self._eval_plane(v1, X, quantities)
+        y2 = self._eval_plane(v2, X, quantities)
         # Linear interpolation in VDS
-        t = (vds - v1) / (v2 - v1)
-        return y1 + t * (y2 - y1)
+        return {q: y1[q] + t * (y2[q] - y1[q]) for q in quantities}
+
+    def _eval_plane(self, vds_plane: float, X: np.ndarray, quantities) -> dict:
+        """
+        Evaluate all requested quantities on one VDS plane for a stacked
+        query X. Uses the shared basis (one Phi build, one dot per
+        quantity) when available, falling back to the per-quantity
+        interpolators otherwise.
+        """
+        if self.method == "grid":
+            # RegularGridInterpolator axes are (length_nm, gm_id)
+            Xg = np.column_stack([X[:, 1], X[:, 0]])
+            return {q: self.rbf[q][vds_plane](Xg) for q in quantities}
+
+        if self._pending or self._pending_q:
+            self._ensure_plane(vds_plane)
+
+        basis = self._basis.get(vds_plane)
+        if basis is not None:
+            return basis.evaluate(X, quantities)
+
+        joint = self._rbf_vds.get(vds_plane)
+        if joint is not None:
+            Y = joint(X)
+            cols = {q: i for i, q in enumerate(self.quantities)}
+            return {q: Y[:, cols[q]] for q in quantities}
+
+        return {q: self.rbf[q][vds_plane](X) for q in quantities}
+
+    def _interp_in_vds(self, quantities, gm_id, vds, length_nm) -> dict:
+        """
+        Core utility, vectorized over query points:
+          - Points whose vds matches a loaded plane use that RBF directly
+            (they land on the bracket edge with t = 0 or 1).
+          - Intermediate vds is linearly interpolated between the two
+            neighboring planes.
+          - Out-of-range vds is clamped to the nearest plane.
+
+        Queries are grouped by their bracketing (v1, v2) VDS plane pair, so
+        each RBF is called once per group with a stacked X instead of once
+        per point. The same X is reused across all requested quantities,
+        since the evaluation points are identical.
+
+        Returns {quantity: ndarray of predictions}.
+        """
+        if self.backend == "cuda":
+            # GPU fits cannot be evaluated with host arrays; route
+            # through the device path and copy back.
+            return {q: self.predict_batch_gpu(q, gm_id, vds, length_nm,
+                                              as_numpy=True)
+                    for q in quantities}
+
+        avail = self._sorted_vds.get(quantities[0])
+        if avail is None:
+            avail = np.asarray(self._available_vds(quantities[0]))
+        if avail.size == 0:
+            raise ValueError(f"No interpolators for quantity '{quantities[0]}'")
+
+        # The stacked evaluation below assumes every requested quantity
+        # exists on the same VDS planes. load_vds_csvs allows loading a
+        # plane with a quantity missing; when plane sets differ, each
+        # quantity gets its own bracketing pass against its own planes.
+        if len(quantities) > 1:
+            for q in quantities[1:]:
+                other = self._sorted_vds.get(q)
+                if other is None:
+                    other = np.asarray(self._available_vds(q))
+                if not np.array_equal(other, avail):
+                    out = {}
+                    for q2 in quantities:
+                        out.update(self._interp_in_vds(
+                            [q2], gm_id, vds, length_nm))
+                    return out
+
+        # Scalar fast path: reuse the preallocated query buffers instead
+        # of boxing each call's point into fresh arrays. The numbers are
+        # already numeric, so they go straight into the buffer.
+        if (np.isscalar(gm_id) and np.isscalar(vds)
+                and np.isscalar(length_nm)):
+            X = self._X_scratch
+            X[0, 0] = gm_id
+            X[0, 1] = length_nm
+            if avail.size == 1:
+                return self._eval_plane(float(avail[0]), X, quantities)
+            i = int(np.searchsorted(avail, vds)) - 1
+            i = min(max(i, 0), avail.size - 2)
+            t = (vds - avail[i]) / (avail[i + 1] - avail[i])
+            t = min(max(t, 0.0), 1.0)
+            self._t_scratch[0] = t
+            return self._eval_bracket(float(avail[i]), float(avail[i + 1]),
+                                      self._t_scratch, X, quantities)
+
+        gm_id = np.atleast_1d(np.asarray(gm_id, dtype=float))
+        vds = np.atleast_1d(np.asarray(vds, dtype=float))
+        length_nm = np.atleast_1d(np.asarray(length_nm, dtype=float))
+        gm_id, vds, length_nm = np.broadcast_arrays(gm_id, vds, length_nm)
+
+        out = {q: np.empty(gm_id.shape) for q in quantities}
+
+        # Single plane: nothing to interpolate across
+        if avail.size == 1:
+            X = np.column_stack([gm_id, length_nm])
+            for q, y in self._eval_plane(float(avail[0]), X, quantities).items():
+                out[q][:] = y
+            return out
+
+        # Branchless bracketing: one searchsorted assigns every point to
+        # its plane pair (avail[i], avail[i+1]); clipping t to [0, 1]
+        # handles out-of-range vds (clamped to the edge planes) without
+        # separate branches.
+        bracket = np.clip(np.searchsorted(avail, vds) - 1, 0, avail.size - 2)
+        t_all = np.clip((vds - avail[bracket])
+                        / (avail[bracket + 1] - avail[bracket]), 0.0, 1.0)
+
+        for i in np.unique(bracket):
+            mask = bracket == i
+            v1, v2 = float(avail[i]), float(avail[i + 1])
+            t = t_all[mask]
+
+            # One basis build per plane, shared across quantities; the
+            # VDS blend fuses into the matmuls when t is uniform
+            X = np.column_stack([gm_id[mask], length_nm[mask]])
+            y = self._eval_bracket(v1, v2, t, X, quantities)
+            for q in quantities:
+                out[q][mask] = y[q]
+
+        return out
 
     # -------------------------
     # Public: forward prediction
     # -------------------------
-    def predict(self, quantity: str, gm_id: float, vds: float, length_nm: float) -> float:
+    def predict_batch(self, quantity: str, gm_id, vds, length_nm) -> np.ndarray:
         """
-        Predict a single quantity ("id_w", "gmro", or "ft") for given (gm_id, VDS, length_nm).
+        Predict one quantity ("id_w", "gmro", or "ft") for arrays of query
+        points. The three arrays are broadcast against each other, so any
+        of them may be a scalar (e.g. a gm_id sweep at fixed VDS and L).
         """
         if quantity not in self.quantities:
             raise ValueError(
                 f"Unknown quantity '{quantity}', expected one of {self.quantities}")
 
-        return self._interp_in_vds(quantity, gm_id, vds, length_nm)
+        return self._interp_in_vds([quantity], gm_id, vds, length_nm)[quantity]
+
+    def predict_batch_gpu(self, quantity: str, gm_id, vds, length_nm,
+                          as_numpy: bool = False):
+        """
+        GPU variant of predict_batch for backend="cuda" sweeps.
 
-    def predict_all(self, gm_id: float, vds: float, length_nm: float) -> dict:
+        The query is assembled on device, each bracketing plane's RBF is
+        evaluated there, and the VDS blend stays on the GPU. Returns a
+        cupy array by default (so chained device work stays
+        non-blocking); pass as_numpy=True to copy back to the host.
+        """
+        if self.backend != "cuda":
+            raise ValueError("predict_batch_gpu requires backend='cuda'")
+        if quantity not in self.quantities:
+            raise ValueError(
+                f"Unknown quantity '{quantity}', expected one of {self.quantities}")
+
+        import cupy as cp
+
+        if not self._rbf_vds and not self.rbf[quantity]:
+            raise ValueError("No interpolators built. Call build_interpolators().")
+
+        gm_id = cp.atleast_1d(cp.asarray(gm_id, dtype=cp.float64))
+        vds = cp.atleast_1d(cp.asarray(vds, dtype=cp.float64))
+        length_nm = cp.atleast_1d(cp.asarray(length_nm, dtype=cp.float64))
+        gm_id, vds, length_nm = cp.broadcast_arrays(gm_id, vds, length_nm)
+
+        # Misaligned/partial planes live in per-quantity device fits
+        # rather than _rbf_vds; both count toward this quantity's planes.
+        avail_host = sorted(set(self._rbf_vds) | set(self.rbf[quantity]))
+        out = cp.empty(gm_id.shape)
+
+        if len(avail_host) == 1:
+            X = cp.column_stack([gm_id, length_nm])
+            out[:] = self._gpu_eval_plane(quantity, avail_host[0], X)
+            return out.get() if as_numpy else out
+
+        avail = cp.asarray(avail_host)
+        bracket = cp.clip(cp.searchsorted(avail, vds) - 1, 0, avail.size - 2)
+        t_all = cp.clip((vds - avail[bracket])
+                        / (avail[bracket + 1] - avail[bracket]), 0.0, 1.0)
+
+        for i in cp.unique(bracket).get():
+            mask = bracket == i
+            X = cp.column_stack([gm_id[mask], length_nm[mask]])
+            y1 = self._gpu_eval_plane(quantity, avail_host[int(i)], X)
+            y2 = self._gpu_eval_plane(quantity, avail_host[int(i) + 1], X)
+            out[mask] = y1 + t_all[mask] * (y2 - y1)
+
+        return out.get() if as_numpy else out
+
+    def _gpu_eval_plane(self, quantity: str, vds_plane: float, X):
+        """
+        Evaluate one quantity on one VDS plane on device: the joint
+        fit's column when the plane has one, else the plane's
+        per-quantity fit (misaligned or partial planes).
+        """
+        f = self._rbf_vds.get(vds_plane)
+        if f is not None:
+            return f(X)[:, self.quantities.index(quantity)]
+        return self.rbf[quantity][vds_plane](X)
+
+    def predict(self, quantity: str, gm_id: float, vds: float, length_nm: float) -> float:
+        """
+        Predict a single quantity ("id_w", "gmro", or "ft") for given (gm_id, VDS, length_nm).
+        """
+        return float(self.predict_batch(quantity, gm_id, vds, length_nm)[0])
+
+    def predict_all(self, gm_id, vds, length_nm) -> dict:
         """
         Predict all three: Id/W, gmro, ft for given (gm_id, VDS, length_nm).
         Returns a dict: {"id_w": ..., "gmro": ..., "ft": ...}
+
+        Scalar inputs give scalar values; array inputs (broadcast against
+        each other) give arrays.
         """
-        return {
-            "id_w": self.predict("id_w", gm_id, vds, length_nm),
-            "gmro": self.predict("gmro", gm_id, vds, length_nm),
-            "ft":   self.predict("ft",   gm_id, vds, length_nm),
-        }
+        scalar = np.isscalar(gm_id) and np.isscalar(vds) and np.isscalar(length_nm)
+
+        # Specialized compiled path (rbf mode): the code-generated njit
+        # kernel does the VDS bracket and both plane evaluations inline.
+        if scalar and self._predict_fn is not None:
+            y = self._predict_fn(float(gm_id), float(vds), float(length_nm),
+                                 *self._spec_args)
+            return {q: float(v) for q, v in zip(self.quantities, y)}
+
+        # Prelookup fast path: one index search feeding all tables.
+        # Only for linear grids (the corner blend is bilinear) with
+        # axes aligned across quantities, and needs >= 2 VDS planes.
+        if (scalar and self.method == "grid"
+                and self.grid_method == "linear" and self._grid_aligned
+                and self._sorted_vds[self.quantities[0]].size >= 2):
+            t_v, pre = self._prelookup(gm_id, vds, length_nm)
+            out = {}
+            for q in self.quantities:
+                y = [self._apply_interp(self._grid[q][v][2], i_L, t_L, i_g, t_g)
+                     for (v, i_L, t_L, i_g, t_g) in pre]
+                out[q] = float(y[0] + t_v * (y[1] - y[0]))
+            return out
+
+        out = self._interp_in_vds(self.quantities, gm_id, vds, length_nm)
+        if scalar:
+            return {q: float(y[0]) for q, y in out.items()}
+        return out
 
     def estimate_length_from_gmro(self, gm_id: float, gmro_measured: float, vds: float,
                                   return_continuous: bool = False):
@@ -267,67 +1302,23 @@ class LUTInterpolator:
         vds_req = float(vds)
 
         # --- 1) choose nearest VDS plane using RAW gmro data ---
-        avail_vds = sorted(self.data["gmro"].keys())
+        avail_vds = sorted(self._gmro_by_L.keys())
         vds_plane = min(avail_vds, key=lambda x: abs(x - vds_req))
 
-        df_plane = self.data["gmro"][vds_plane]
-
-        # --- 2) interpolate gmro along gm/id for each length ---
-        gmro_pred = {}  # L -> gmro_pred
-
-        for L in self.lengths:
-            df_L = df_plane[df_plane["length_nm"] == L]
-            if df_L.empty:
-                continue
+        # --- 2) interpolate gmro along gm/id on each length's raw
+        # curve (its exact gm_id axis, no resampling)
+        curves = self._gmro_by_L[vds_plane]
+        lengths_arr = np.array(sorted(curves), dtype=float)
+        gmro_pred = np.array([np.interp(gm_id, *curves[int(L)])
+                              for L in lengths_arr])
 
-            df_L = df_L.sort_values("gm_id")
-            gmids = df_L["gm_id"].values
-            vals = df_L["value"].values
-
-            # 1D linear interpolation in gm_id
-            gmro_L = float(np.interp(gm_id, gmids, vals))
-            gmro_pred[L] = gmro_L
-
-        if not gmro_pred:
-            raise ValueError(
-                f"No gmro data available at VDS={vds_plane} for any length.")
-
-        # Ensure ordered by length
-        lengths_ordered = sorted(gmro_pred.keys())
-
-        # --- 3) find bracket L1, L2 where gmro_measured lies between gmro_pred ---
-        L_est = None
-        L_disc = None
-        bracket_found = False
-
-        for i in range(len(lengths_ordered) - 1):
-            L1 = lengths_ordered[i]
-            L2 = lengths_ordered[i + 1]
-            g1 = gmro_pred[L1]
-            g2 = gmro_pred[L2]
-
-            # Check if gmro_measured lies between g1 and g2 (any order)
-            if (g1 <= gmro_measured <= g2) or (g2 <= gmro_measured <= g1):
-                bracket_found = True
-
-                # --- 4) continuous L* by linear interpolation between (L1,g1) and (L2,g2) ---
-                if abs(g2 - g1) < 1e-12:
-                    # essentially flat; take midpoint
-                    L_est = 0.5 * (L1 + L2)
-                else:
-                    t = (gmro_measured - g1) / (g2 - g1)
-                    L_est = L1 + t * (L2 - L1)
-
-                # --- 5) discrete length per your rule = max(L1, L2) ---
-                L_disc = max(L1, L2)
-                break
-
-        # --- no bracket found: fall back to nearest gmro_pred ---
-        if not bracket_found:
-            L_disc = min(lengths_ordered, key=lambda L: abs(
-                gmro_pred[L] - gmro_measured))
-            if L_est is None:
-                L_est = float(L_disc)
+        # --- 3-5) run the numeric core (numba-compiled when available):
+        # find the first bracket via sign change and apply the
+        # max(L1, L2) rule.
+        L_est, L_disc = _estimate_length_core(
+            gmro_pred, gmro_measured, lengths_arr)
+        L_est = float(L_est)
+        L_disc = int(L_disc)
 
         if return_continuous:
             return L_est, L_disc